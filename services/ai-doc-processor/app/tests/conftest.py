@@ -0,0 +1,82 @@
+"""
+Shared fixtures for the orchestrator Lambda handler tests.
+
+The handler module builds its boto3 clients and makes its warm-up calls at
+import time, so it is imported once with AWS API calls stubbed out. Each test
+then swaps the module's clients for fresh mocks.
+"""
+import importlib
+import io
+import json
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+ORCHESTRATOR_DIR = Path(__file__).resolve().parents[1] / "orchestrator"
+TEST_BUCKET      = "ai-doc-test-bucket"
+
+os.environ.update(
+    AWS_REGION="ap-southeast-2",
+    AWS_DEFAULT_REGION="ap-southeast-2",
+    AWS_ACCESS_KEY_ID="testing",
+    AWS_SECRET_ACCESS_KEY="testing",
+    AWS_EC2_METADATA_DISABLED="true",
+    ENV_NAME="test",
+    MODEL_ID="test-model",
+    ORCHESTRATOR_MODE="scripted",
+    POWERTOOLS_METRICS_NAMESPACE="AIDocProcessor",
+    POWERTOOLS_TRACE_DISABLED="1",
+)
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+@dataclass
+class FakeLambdaContext:
+    function_name: str = "OrchestratorContainer-test"
+    memory_limit_in_mb: int = 2048
+    invoked_function_arn: str = (
+        "arn:aws:lambda:ap-southeast-2:123456789012:function:OrchestratorContainer-test"
+    )
+    aws_request_id: str = "req-1"
+
+
+def s3_record(key: str, bucket: str = TEST_BUCKET) -> dict:
+    """A single S3 ObjectCreated notification record."""
+    return {"eventSource": "aws:s3", "s3": {"bucket": {"name": bucket}, "object": {"key": key}}}
+
+
+def s3_body(payload: dict) -> dict:
+    """A get_object response whose Body streams ``payload`` as JSON."""
+    return {"Body": io.BytesIO(json.dumps(payload).encode("utf-8"))}
+
+
+def _import_handler():
+    sys.path.insert(0, str(ORCHESTRATOR_DIR))
+    with patch("botocore.client.BaseClient._make_api_call", return_value={}):
+        return importlib.import_module("lambda_function")
+
+
+_HANDLER_MODULE = _import_handler()
+
+
+# ── Fixtures ──────────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    """The handler module in scripted mode with mocked Lambda and S3 clients."""
+    monkeypatch.setattr(_HANDLER_MODULE, "lambda_client", MagicMock())
+    monkeypatch.setattr(_HANDLER_MODULE, "s3_client", MagicMock())
+    monkeypatch.setattr(_HANDLER_MODULE, "ORCHESTRATOR_MODE", "scripted")
+    return _HANDLER_MODULE
+
+
+@pytest.fixture
+def context() -> FakeLambdaContext:
+    return FakeLambdaContext()
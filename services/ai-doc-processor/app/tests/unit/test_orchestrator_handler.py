@@ -0,0 +1,226 @@
+"""
+Unit tests for the orchestrator Lambda handler.
+
+The Lambda and S3 clients are mocks (see ``tests/conftest.py``), so the suite
+needs no AWS credentials and never imports strands.
+
+Run:
+    cd services/ai-doc-processor/app
+    pytest tests/ -v
+"""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from tests.conftest import TEST_BUCKET, s3_body, s3_record
+
+VALID_EXTRACTION = {
+    "invoice_number": "INV-001",
+    "date": "2025-01-31",
+    "total_amount": "120.00",
+    "vendor_name": "Acme Pty Ltd",
+}
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def downstream(orchestrator, monkeypatch):
+    """Replace the SAP and WhatsApp stages with mocks that record their inputs."""
+    stages = {}
+    for name in ("perform_invoice_posting_to_sap", "send_whatsapp_notification"):
+        stages[name] = MagicMock(return_value=json.dumps("ok"))
+        monkeypatch.setitem(orchestrator._PARALLEL_STAGES, name, stages[name])
+    return stages
+
+
+def _results(response: dict) -> list:
+    return json.loads(response["body"])["results"]
+
+
+# ── Async extraction ──────────────────────────────────────────────────────────
+
+def test_upload_submits_extraction_and_stops(orchestrator, context, downstream):
+    """An upload only submits extraction; downstream stages wait for the result."""
+    response = orchestrator.lambda_handler({"Records": [s3_record("uploads/invoice.pdf")]}, context)
+
+    (call,) = orchestrator.lambda_client.invoke.call_args_list
+    assert call.kwargs["InvocationType"] == "Event"
+    payload = json.loads(call.kwargs["Payload"])
+    assert payload["output"] == {"s3_bucket": TEST_BUCKET, "s3_key": "extraction-results/req-1-0.json"}
+
+    assert _results(response) == [{"bucket": TEST_BUCKET, "key": "uploads/invoice.pdf", "status": "submitted"}]
+    for stage in downstream.values():
+        stage.assert_not_called()
+
+
+def test_extraction_result_resumes_pipeline(orchestrator, context, downstream):
+    """A result object resumes the pipeline with the extracted data, not the receipt."""
+    orchestrator.s3_client.get_object.return_value = s3_body(VALID_EXTRACTION)
+    result_key = "extraction-results/req-0-0.json"
+
+    response = orchestrator.lambda_handler({"Records": [s3_record(result_key)]}, context)
+
+    orchestrator.s3_client.get_object.assert_called_once_with(Bucket=TEST_BUCKET, Key=result_key)
+    orchestrator.lambda_client.invoke.assert_not_called()
+    for stage in downstream.values():
+        stage.assert_called_once()
+        kwargs = stage.call_args.kwargs
+        assert json.loads(kwargs["extracted_data"]) == VALID_EXTRACTION
+        assert kwargs["processId"] == "req-0-0"
+    assert _results(response) == [{"bucket": TEST_BUCKET, "key": result_key, "status": "processed"}]
+
+
+def test_url_encoded_keys_are_decoded(orchestrator, context):
+    """S3 event keys arrive URL-encoded; the pipeline must use the real object key."""
+    response = orchestrator.lambda_handler({"Records": [s3_record("uploads/my+invoice%282%29.pdf")]}, context)
+
+    payload = json.loads(orchestrator.lambda_client.invoke.call_args.kwargs["Payload"])
+    assert payload["parameters"]["s3_key"] == "uploads/my invoice(2).pdf"
+    assert _results(response)[0]["key"] == "uploads/my invoice(2).pdf"
+
+
+def test_objects_outside_pipeline_prefixes_are_ignored(orchestrator, context):
+    """Other objects the extractor writes (e.g. page images) must not start a new run."""
+    response = orchestrator.lambda_handler({"Records": [s3_record("imageOutput/page-1.png")]}, context)
+
+    assert _results(response) == [{"bucket": TEST_BUCKET, "key": "imageOutput/page-1.png", "status": "ignored"}]
+    orchestrator.lambda_client.invoke.assert_not_called()
+    orchestrator.s3_client.get_object.assert_not_called()
+
+
+# ── Validation gate ───────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("result_body", [
+    {"invoice_number": "INV-001", "vendor_name": "Acme Pty Ltd"},
+    {"status": "submitted", "result_location": "s3://bucket/key"},
+])
+def test_invalid_extraction_skips_downstream(orchestrator, context, downstream, result_body):
+    """SAP posting and WhatsApp must not run when validation fails."""
+    orchestrator.s3_client.get_object.return_value = s3_body(result_body)
+    result_key = "extraction-results/req-0-0.json"
+
+    response = orchestrator.lambda_handler({"Records": [s3_record(result_key)]}, context)
+
+    assert _results(response) == [{"bucket": TEST_BUCKET, "key": result_key, "status": "failed"}]
+    for stage in downstream.values():
+        stage.assert_not_called()
+
+
+def test_validation_reports_missing_fields(orchestrator):
+    """validate_invoice_data names every missing required field."""
+    result = json.loads(orchestrator.validate_invoice_data(
+        extracted_data={"invoice_number": "INV-001"}, processId="p-1",
+    ))
+    assert result["is_valid"] is False
+    assert result["missing_fields"] == ["date", "total_amount", "vendor_name"]
+
+
+# ── Invocation dispatch ───────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("event, source", [
+    ({"source": "aws.events"}, "ping"),
+    ({"httpMethod": "GET", "path": "/items"}, "http"),
+    ({"requestContext": {"http": {"method": "GET"}}}, "http"),
+    ({"Records": [s3_record("uploads/invoice.pdf")]}, "s3"),
+    ({"Records": [{"eventSource": "aws:sqs"}]}, "unknown"),
+    ({"Records": []}, "unknown"),
+    ({}, "unknown"),
+])
+def test_classify(orchestrator, event, source):
+    assert orchestrator._classify(event) == source
+
+
+def test_ping_and_unknown_responses(orchestrator, context):
+    assert orchestrator.lambda_handler({"source": "aws.events"}, context) == {"statusCode": 200, "body": "pong"}
+    assert orchestrator.lambda_handler({}, context)["statusCode"] == 400
+    orchestrator.lambda_client.invoke.assert_not_called()
+
+
+# ── S3 batches ────────────────────────────────────────────────────────────────
+
+def test_batch_processes_every_record(orchestrator, context, downstream):
+    """Each S3 record in a batch gets its own processId and result entry."""
+    event = {"Records": [s3_record("uploads/a.pdf"), {"eventSource": "aws:sqs"}, s3_record("uploads/b.pdf")]}
+
+    response = orchestrator.lambda_handler(event, context)
+
+    submitted = sorted(
+        json.loads(call.kwargs["Payload"])["processId"]
+        for call in orchestrator.lambda_client.invoke.call_args_list
+    )
+    assert submitted == ["req-1-0", "req-1-2"]
+    assert _results(response) == [
+        {"bucket": TEST_BUCKET, "key": "uploads/a.pdf", "status": "submitted"},
+        {"bucket": None, "key": None, "status": "skipped"},
+        {"bucket": TEST_BUCKET, "key": "uploads/b.pdf", "status": "submitted"},
+    ]
+
+
+def test_failed_record_does_not_stop_the_batch(orchestrator, context, downstream):
+    """One failing record is reported, the others still run, then the invocation fails."""
+    def get_object(Bucket, Key):
+        if Key == "extraction-results/p-1.json":
+            raise RuntimeError("S3 unavailable")
+        return s3_body(VALID_EXTRACTION)
+
+    orchestrator.s3_client.get_object.side_effect = get_object
+    event = {"Records": [
+        s3_record("extraction-results/p-1.json"),
+        s3_record("extraction-results/p-2.json"),
+    ]}
+
+    with pytest.raises(RuntimeError, match="1 of 2 S3 records failed"):
+        orchestrator.lambda_handler(event, context)
+
+    (sap_call,) = downstream["perform_invoice_posting_to_sap"].call_args_list
+    assert sap_call.kwargs["processId"] == "p-2"
+
+
+# ── Agent mode ────────────────────────────────────────────────────────────────
+
+def test_agent_mode_clears_history_per_record(orchestrator, context, monkeypatch):
+    """Agent mode runs records one at a time on a fresh conversation each."""
+    fake_agent = MagicMock(messages=["left over"])
+    fake_agent.side_effect = lambda prompt: fake_agent.messages.append(prompt)
+    monkeypatch.setattr(orchestrator, "ORCHESTRATOR_MODE", "agent")
+    monkeypatch.setattr(orchestrator, "_ORCHESTRATOR", fake_agent)
+    event = {"Records": [s3_record("uploads/invoice.pdf"), s3_record("extraction-results/req-0-0.json")]}
+
+    response = orchestrator.lambda_handler(event, context)
+
+    upload_prompt, result_prompt = (call.args[0] for call in fake_agent.call_args_list)
+    assert "textract_extraction_agent" in upload_prompt and "req-1-0" in upload_prompt
+    assert "read_extraction_result" in result_prompt and "req-0-0" in result_prompt
+    assert fake_agent.messages == [result_prompt]
+    assert [r["status"] for r in _results(response)] == ["submitted", "completed"]
+
+
+@pytest.mark.parametrize("extracted, status", [
+    (VALID_EXTRACTION, "processed"),
+    ({"invoice_number": "INV-001"}, "failed"),
+])
+def test_agent_mode_status_follows_validation(orchestrator, context, monkeypatch, extracted, status):
+    """An agent-mode resume reports the outcome of the validation the model ran."""
+    fake_agent = MagicMock(messages=[])
+    fake_agent.side_effect = lambda prompt: orchestrator.validate_invoice_data(
+        extracted_data=extracted, processId="req-0-0",
+    )
+    monkeypatch.setattr(orchestrator, "ORCHESTRATOR_MODE", "agent")
+    monkeypatch.setattr(orchestrator, "_ORCHESTRATOR", fake_agent)
+    result_key = "extraction-results/req-0-0.json"
+
+    response = orchestrator.lambda_handler({"Records": [s3_record(result_key)]}, context)
+
+    assert _results(response) == [{"bucket": TEST_BUCKET, "key": result_key, "status": status}]
+    assert orchestrator._VALIDATION_OUTCOMES == {}
+
+
+def test_latency_optimized_inference_is_opt_in(orchestrator, monkeypatch):
+    """performanceConfig is only sent when BEDROCK_LATENCY is "optimized"."""
+    assert orchestrator.BEDROCK_LATENCY == "standard"
+    assert orchestrator._bedrock_additional_args() == {}
+
+    monkeypatch.setattr(orchestrator, "BEDROCK_LATENCY", "optimized")
+    assert orchestrator._bedrock_additional_args() == {"performanceConfig": {"latency": "optimized"}}
@@ -1,6 +1,7 @@
 import aws_cdk as cdk
 from aws_cdk import (
     aws_lambda as _lambda,
+    aws_ecr_assets as ecr_assets,
     aws_s3 as s3,
     aws_s3_notifications as s3n,
     aws_apigateway as apigw,
@@ -47,6 +48,22 @@ class AiDocProcessorStack(BaseServiceStack):
 
         # ── Orchestrator Lambda (Docker image) ─────────────────────────────
         orchestrator_lambda_name = f"OrchestratorContainer-{self.env_name}"
+        extraction_lambda_name = f"InvoiceExtractionContainer-{self.env_name}"
+        # Documents are uploaded under uploads/; the extraction agent writes
+        # its results under extraction-results/ in the same bucket. Anything
+        # else it writes (e.g. page images) must not re-trigger the pipeline.
+        uploads_prefix = "uploads/"
+        extraction_results_prefix = "extraction-results/"
+        prompt_bucket = "prompts-dev"
+        prompt_key = "orchestrator/Orchestrator.txt"
+        # Provisioned concurrency scales between 1 and 5; reserved concurrency
+        # sits one above that ceiling so $LATEST and other versions (e.g. the
+        # Power Tuning sweep) are never throttled by a fully provisioned pool.
+        orchestrator_provisioned_max = 5
+        orchestrator_reserved_concurrency = orchestrator_provisioned_max + 1
+        model_id = "anthropic.claude-sonnet-4-20250514-v1:0"
+        # APAC cross-region inference profile used by the orchestrator agent
+        model_profile_arn = f"arn:aws:bedrock:{region}:{account}:inference-profile/apac.{model_id}"
 
         orchestrator_lambda = _lambda.DockerImageFunction(
             self,
@@ -55,56 +72,104 @@ class AiDocProcessorStack(BaseServiceStack):
             code=_lambda.DockerImageCode.from_image_asset(
                 "../app/orchestrator",  # folder containing Dockerfile
                 build_args={
-                    "MODEL_ID": (
-                        f"arn:aws:bedrock:{region}:{account}:"
-                        "inference-profile/apac.anthropic.claude-sonnet-4-20250514-v1:0"
-                    ),
-                    "PROMPT_BUCKET": "prompts-dev",
-                    "PROMPT_KEY": "orchestrator/Orchestrator.txt",
+                    "MODEL_ID": model_profile_arn,
+                    "PROMPT_BUCKET": prompt_bucket,
+                    "PROMPT_KEY": prompt_key,
                     "SERVICE_NAME": "ai-doc-processor",
                 },
+                platform=ecr_assets.Platform.LINUX_ARM64,
             ),
+            architecture=_lambda.Architecture.ARM_64,  # Graviton
+            memory_size=2048,  # more memory = more vCPU for INIT and JSON/TLS work
             timeout=Duration.minutes(10),
-            reserved_concurrent_executions=1,  # limit to 1 concurrent execution
+            reserved_concurrent_executions=orchestrator_reserved_concurrency,
             environment={
                 "ENV_NAME": self.env_name,
+                "EXTRACTION_AGENT_LAMBDA": extraction_lambda_name,
+                "UPLOADS_PREFIX": uploads_prefix,
+                "EXTRACTION_RESULTS_PREFIX": extraction_results_prefix,
                 "SERVICE_NAME": "ai-doc-processor",
                 "POWERTOOLS_SERVICE_NAME": "ai-doc-processor",
                 "POWERTOOLS_METRICS_NAMESPACE": "AIDocProcessor",
                 "LOG_LEVEL": "INFO",
+                "ORCHESTRATOR_MODE": "agent",  # "scripted" bypasses the Bedrock agent loop
+                # Claude Sonnet 4 is not on Bedrock's latency-optimized model list
+                "BEDROCK_LATENCY": "standard",
             },
         )
 
-        # ── S3 trigger ─────────────────────────────────────────────────────
+        # ── Provisioned concurrency ────────────────────────────────────────
+        # Keep one execution environment initialised (agent, Bedrock client,
+        # prompt) so the first upload after an idle period skips the cold start,
+        # scaling up on utilisation during bursts of uploads.
+        orchestrator_alias = _lambda.Alias(
+            self,
+            "OrchestratorLiveAlias",
+            alias_name="live",
+            version=orchestrator_lambda.current_version,
+            provisioned_concurrent_executions=1,
+        )
+        orchestrator_alias.add_auto_scaling(
+            min_capacity=1,
+            max_capacity=orchestrator_provisioned_max,
+        ).scale_on_utilization(utilization_target=0.7)
+
+        # ── S3 triggers ────────────────────────────────────────────────────
+        # New uploads start the pipeline; extraction results resume it.
         bucket.add_event_notification(
             s3.EventType.OBJECT_CREATED,
-            s3n.LambdaDestination(orchestrator_lambda),
+            s3n.LambdaDestination(orchestrator_alias),
+            s3.NotificationKeyFilter(prefix=uploads_prefix),
+        )
+        bucket.add_event_notification(
+            s3.EventType.OBJECT_CREATED,
+            s3n.LambdaDestination(orchestrator_alias),
+            s3.NotificationKeyFilter(prefix=extraction_results_prefix, suffix=".json"),
         )
 
         # Grant the Lambda function read permissions on the S3 bucket
         bucket.grant_read(orchestrator_lambda)
 
         # ── IAM policies for Textract and Bedrock ──────────────────────────
+        # Least privilege: only the actions the pipeline calls. Textract has no
+        # resource-level permissions, so it stays on "*".
         textract_policy = iam.PolicyStatement(
-            actions=["textract:*"],
+            actions=["textract:AnalyzeDocument", "textract:AnalyzeExpense"],
             resources=["*"],
         )
+        # The inference profile routes to the foundation model in any APAC
+        # region, so the model ARN needs a region wildcard.
         bedrock_policy = iam.PolicyStatement(
             actions=[
                 "bedrock:InvokeModel",
                 "bedrock:InvokeModelWithResponseStream",
-                "bedrock:ListFoundationModels",
-                "bedrock:ListPrompts",
-                "bedrock:GetPrompt",
-                "bedrock:ListPromptVersions",
-                "bedrock-agentcore:InvokeAgentRuntime",
             ],
-            resources=["*"],
+            resources=[
+                model_profile_arn,
+                f"arn:aws:bedrock:*::foundation-model/{model_id}",
+            ],
         )
 
         orchestrator_lambda.add_to_role_policy(textract_policy)
         orchestrator_lambda.add_to_role_policy(bedrock_policy)
 
+        # The extraction agent is invoked asynchronously (InvocationType=Event)
+        # and writes its results back to the bucket under extraction-results/.
+        orchestrator_lambda.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["lambda:InvokeFunction", "lambda:GetFunctionConfiguration"],
+                resources=[f"arn:aws:lambda:{region}:{account}:function:{extraction_lambda_name}"],
+            )
+        )
+
+        # The system prompt is read from S3 once per container during INIT
+        orchestrator_lambda.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["s3:GetObject"],
+                resources=[f"arn:aws:s3:::{prompt_bucket}/{prompt_key}"],
+            )
+        )
+
         # Allow Lambda Powertools to publish custom EMF metrics to CloudWatch
         orchestrator_lambda.add_to_role_policy(
             iam.PolicyStatement(
@@ -118,7 +183,7 @@ class AiDocProcessorStack(BaseServiceStack):
         api = apigw.LambdaRestApi(
             self,
             "AIDocProcessorApi",
-            handler=orchestrator_lambda,
+            handler=orchestrator_alias,
             proxy=False,
         )
 
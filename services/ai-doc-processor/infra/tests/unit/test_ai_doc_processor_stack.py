@@ -23,6 +23,11 @@ from stack.ai_doc_processor_stack import AiDocProcessorStack
 TEST_ACCOUNT = "123456789012"
 TEST_REGION  = "ap-southeast-2"
 TEST_ENV     = core.Environment(account=TEST_ACCOUNT, region=TEST_REGION)
+MODEL_RESOURCES = [
+    f"arn:aws:bedrock:{TEST_REGION}:{TEST_ACCOUNT}:"
+    "inference-profile/apac.anthropic.claude-sonnet-4-20250514-v1:0",
+    "arn:aws:bedrock:*::foundation-model/anthropic.claude-sonnet-4-20250514-v1:0",
+]
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
@@ -34,13 +39,14 @@ class _FakeDockerImageFunction(_lambda.Function):
     the ``code`` kwarg and substitutes a trivial inline handler so that CDK
     can synthesise the CloudFormation template without a running Docker daemon.
 
-    All other properties (function_name, timeout, reserved_concurrent_executions)
-    are forwarded to the parent Function constructor so that every assertion
+    All other properties (function_name, timeout, reserved_concurrent_executions,
+    architecture, memory_size) are forwarded to the parent Function constructor so that every assertion
     about those properties still holds.
     """
 
     def __init__(self, scope, id, *, function_name=None, timeout=None,
-                 reserved_concurrent_executions=None, **kwargs):
+                 reserved_concurrent_executions=None, architecture=None,
+                 memory_size=None, **kwargs):
         kwargs.pop("code", None)   # discard DockerImageCode — not needed in tests
         super().__init__(
             scope, id,
@@ -50,6 +56,8 @@ class _FakeDockerImageFunction(_lambda.Function):
             function_name=function_name,
             timeout=timeout,
             reserved_concurrent_executions=reserved_concurrent_executions,
+            architecture=architecture,
+            memory_size=memory_size,
         )
 
 
@@ -66,40 +74,77 @@ def template() -> assertions.Template:
     return assertions.Template.from_stack(stack)
 
 
+@pytest.fixture(scope="module")
+def lambda_resource(template) -> dict:
+    """Look up the orchestrator Lambda once and share its resource dict across tests."""
+    functions = template.find_resources("AWS::Lambda::Function", {
+        "Properties": {"FunctionName": "OrchestratorContainer-test"},
+    })
+    assert len(functions) == 1, "Expected exactly one OrchestratorContainer-test function"
+    return next(iter(functions.values()))
+
+
 # ── Lambda ────────────────────────────────────────────────────────────────────
 
-def test_lambda_function_name(template):
+def test_lambda_function_name(lambda_resource):
     """Orchestrator Lambda name must follow OrchestratorContainer-<env_name>."""
-    template.has_resource_properties("AWS::Lambda::Function", {
-        "FunctionName": "OrchestratorContainer-test",
-    })
+    assert lambda_resource["Properties"]["FunctionName"] == "OrchestratorContainer-test"
 
 
-def test_lambda_timeout_is_ten_minutes(template):
+def test_lambda_timeout_is_ten_minutes(lambda_resource):
     """Lambda timeout must be 600 s (10 min) to accommodate long-running Bedrock calls."""
-    template.has_resource_properties("AWS::Lambda::Function", {
-        "FunctionName": "OrchestratorContainer-test",
-        "Timeout": 600,
+    assert lambda_resource["Properties"]["Timeout"] == 600
+
+
+def test_lambda_reserved_concurrency_is_six(lambda_resource):
+    """Reserved concurrency must leave one execution above the provisioned-concurrency ceiling."""
+    assert lambda_resource["Properties"]["ReservedConcurrentExecutions"] == 6
+
+
+def test_lambda_memory_size(lambda_resource):
+    """Orchestrator Lambda memory must be 2048 MB."""
+    assert lambda_resource["Properties"]["MemorySize"] == 2048
+
+
+def test_lambda_runs_on_arm64(lambda_resource):
+    """Orchestrator Lambda must run on Graviton (arm64)."""
+    assert lambda_resource["Properties"]["Architectures"] == ["arm64"]
+
+
+def test_live_alias_has_provisioned_concurrency(template):
+    """The live alias must keep one provisioned execution environment warm."""
+    template.has_resource_properties("AWS::Lambda::Alias", {
+        "Name": "live",
+        "ProvisionedConcurrencyConfig": {"ProvisionedConcurrentExecutions": 1},
     })
 
 
-def test_lambda_reserved_concurrency_is_one(template):
-    """Reserved concurrency must be 1 to prevent runaway parallel invocations."""
-    template.has_resource_properties("AWS::Lambda::Function", {
-        "FunctionName": "OrchestratorContainer-test",
-        "ReservedConcurrentExecutions": 1,
+def test_provisioned_concurrency_autoscaling_target(template):
+    """Provisioned concurrency must be auto-scaled on utilisation below the reserved limit."""
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "MinCapacity": 1,
+        "MaxCapacity": 5,
+        "ScalableDimension": "lambda:function:ProvisionedConcurrency",
+    })
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalingPolicy", {
+        "TargetTrackingScalingPolicyConfiguration": assertions.Match.object_like({
+            "TargetValue": 0.7,
+            "PredefinedMetricSpecification": {
+                "PredefinedMetricType": "LambdaProvisionedConcurrencyUtilization",
+            },
+        }),
     })
 
 
 # ── IAM ───────────────────────────────────────────────────────────────────────
 
 def test_textract_policy_attached(template):
-    """Lambda execution role must grant textract:* on all resources."""
+    """Lambda execution role must grant only the Textract analysis actions."""
     template.has_resource_properties("AWS::IAM::Policy", {
         "PolicyDocument": {
             "Statement": assertions.Match.array_with([
                 assertions.Match.object_like({
-                    "Action": "textract:*",
+                    "Action": ["textract:AnalyzeDocument", "textract:AnalyzeExpense"],
                     "Effect": "Allow",
                     "Resource": "*",
                 })
@@ -109,14 +154,14 @@ def test_textract_policy_attached(template):
 
 
 def test_bedrock_invoke_model_policy_attached(template):
-    """Lambda execution role must include bedrock:InvokeModel."""
+    """Lambda execution role must include bedrock:InvokeModel, scoped to the model."""
     template.has_resource_properties("AWS::IAM::Policy", {
         "PolicyDocument": {
             "Statement": assertions.Match.array_with([
                 assertions.Match.object_like({
                     "Action": assertions.Match.array_with(["bedrock:InvokeModel"]),
                     "Effect": "Allow",
-                    "Resource": "*",
+                    "Resource": MODEL_RESOURCES,
                 })
             ])
         }
@@ -124,7 +169,7 @@ def test_bedrock_invoke_model_policy_attached(template):
 
 
 def test_bedrock_streaming_policy_attached(template):
-    """Lambda execution role must include bedrock:InvokeModelWithResponseStream."""
+    """Lambda execution role must include bedrock:InvokeModelWithResponseStream, scoped to the model."""
     template.has_resource_properties("AWS::IAM::Policy", {
         "PolicyDocument": {
             "Statement": assertions.Match.array_with([
@@ -133,7 +178,40 @@ def test_bedrock_streaming_policy_attached(template):
                         ["bedrock:InvokeModelWithResponseStream"]
                     ),
                     "Effect": "Allow",
-                    "Resource": "*",
+                    "Resource": MODEL_RESOURCES,
+                })
+            ])
+        }
+    })
+
+
+def test_extraction_lambda_invoke_policy_attached(template):
+    """Lambda execution role must be able to invoke the extraction agent Lambda."""
+    template.has_resource_properties("AWS::IAM::Policy", {
+        "PolicyDocument": {
+            "Statement": assertions.Match.array_with([
+                assertions.Match.object_like({
+                    "Action": assertions.Match.array_with(["lambda:InvokeFunction"]),
+                    "Effect": "Allow",
+                    "Resource": (
+                        f"arn:aws:lambda:{TEST_REGION}:{TEST_ACCOUNT}:"
+                        "function:InvoiceExtractionContainer-test"
+                    ),
+                })
+            ])
+        }
+    })
+
+
+def test_prompt_read_policy_attached(template):
+    """Lambda execution role must be able to read the orchestrator system prompt."""
+    template.has_resource_properties("AWS::IAM::Policy", {
+        "PolicyDocument": {
+            "Statement": assertions.Match.array_with([
+                assertions.Match.object_like({
+                    "Action": "s3:GetObject",
+                    "Effect": "Allow",
+                    "Resource": "arn:aws:s3:::prompts-dev/orchestrator/Orchestrator.txt",
                 })
             ])
         }
@@ -162,6 +240,19 @@ def test_s3_bucket_created(template):
     assert len(buckets) >= 1, "Expected at least one S3::Bucket resource in the stack"
 
 
+def test_s3_notifications_filtered_by_prefix(template):
+    """Only uploads/ and extraction-results/*.json may trigger the orchestrator."""
+    (notifications,) = template.find_resources("Custom::S3BucketNotifications").values()
+    filters = [
+        {rule["Name"]: rule["Value"] for rule in config["Filter"]["Key"]["FilterRules"]}
+        for config in notifications["Properties"]["NotificationConfiguration"]["LambdaFunctionConfigurations"]
+    ]
+    assert filters == [
+        {"prefix": "uploads/"},
+        {"prefix": "extraction-results/", "suffix": ".json"},
+    ]
+
+
 # ── API Gateway ───────────────────────────────────────────────────────────────
 
 def test_api_gateway_rest_api_created(template):
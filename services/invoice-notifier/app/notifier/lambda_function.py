@@ -1,6 +1,13 @@
-import json
+import logging
 import os
-import boto3
+
+import orjson
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+logger = logging.getLogger()
+logger.setLevel(LOG_LEVEL)
+
 
 def lambda_handler(event, context):
     """Invoice notification handler lambda demo.
@@ -8,14 +15,18 @@ def lambda_handler(event, context):
     Receives an invoice payload via API Gateway POST /notify and
     publishes a notification (stub implementation).
     """
+    # Only serialise the full event when DEBUG is on; it can be several KB.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received event: %s", orjson.dumps(event).decode())
+
     body = event.get("body") or "{}"
     if isinstance(body, str):
         try:
-            payload = json.loads(body)
-        except json.JSONDecodeError:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError:
             return {
                 "statusCode": 400,
-                "body": json.dumps({"error": "Invalid JSON body"}),
+                "body": orjson.dumps({"error": "Invalid JSON body"}).decode(),
             }
     else:
         payload = body
@@ -23,10 +34,11 @@ def lambda_handler(event, context):
     invoice_id = payload.get("invoice_id", "unknown")
 
     # Stub: log and return acknowledgement
-    print(f"Processing notification for invoice: {invoice_id}")
+    logger.info("Processing notification for invoice: %s", invoice_id)
 
     return {
         "statusCode": 200,
         "headers": {"Content-Type": "application/json"},
-        "body": json.dumps({"message": f"Notification queued for invoice {invoice_id}"}),
+        # API Gateway requires a str body; orjson emits bytes.
+        "body": orjson.dumps({"message": f"Notification queued for invoice {invoice_id}"}).decode(),
     }
@@ -1,5 +1,8 @@
+from typing import Callable
+
 from aws_cdk import (
     aws_lambda as _lambda,
+    aws_ecr_assets as ecr_assets,
     aws_apigateway as apigw,
     aws_iam as iam,
     aws_s3 as s3,
@@ -13,7 +16,15 @@ from constructs_lib.base_lambda_stack import BaseServiceStack
 
 class InvoiceNotifierStack(BaseServiceStack):
 
-    def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
+    def __init__(
+        self,
+        scope: Construct,
+        construct_id: str,
+        *,
+        # Builds the notifier function; tests inject a stand-in that skips the Docker build
+        lambda_factory: Callable[..., _lambda.IFunction] = _lambda.DockerImageFunction,
+        **kwargs,
+    ) -> None:
         super().__init__(scope, construct_id, service_name="invoice-notifier", **kwargs)
 
         account = self.node.try_get_context("account") or self.account
@@ -28,7 +39,7 @@ class InvoiceNotifierStack(BaseServiceStack):
             auto_delete_objects=True,
         )
 
-        notifier_fn = _lambda.DockerImageFunction(
+        notifier_fn = lambda_factory(
             self,
             "InvoiceNotifier",
             function_name=f"InvoiceNotifier-{self.env_name}",
@@ -37,7 +48,10 @@ class InvoiceNotifierStack(BaseServiceStack):
                 build_args={
                     "MODEL_ID": f"arn:aws:bedrock:{region}:{account}:inference-profile/apac.anthropic.claude-sonnet-4-20250514-v1:0",
                 },
+                platform=ecr_assets.Platform.LINUX_ARM64,
             ),
+            architecture=_lambda.Architecture.ARM_64,  # Graviton
+            memory_size=2048,  # provisional: matches the orchestrator until Power Tuning has run on this function
             timeout=Duration.minutes(5),
         )
 
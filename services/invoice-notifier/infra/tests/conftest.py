@@ -0,0 +1,86 @@
+"""
+Shared fixtures for the InvoiceNotifierStack unit tests.
+
+The synthesised template is immutable, so it is built once per test session
+and shared by every test module under ``tests/``.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+# aws_cdk (and the stack module, which imports it) is imported inside the
+# fixtures below so that collecting tests does not start the jsii runtime.
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+TEST_ACCOUNT = "123456789012"
+TEST_REGION  = "ap-southeast-2"
+FAKE_ROLE_ARN = f"arn:aws:iam::{TEST_ACCOUNT}:role/fake"
+
+# Passed as post-CLI context so per-resource path metadata stays out of the
+# template even when CDK_CONTEXT_JSON enables it; AWS::CDK::Metadata is
+# switched off with App(analytics_reporting=False).
+_SYNTH_CONTEXT = {"aws:cdk:enable-path-metadata": False}
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _fake_docker_image_function(scope, id, *, function_name=None, timeout=None,
+                                reserved_concurrent_executions=None, architecture=None,
+                                memory_size=None, **kwargs):
+    """Stand-in for DockerImageFunction that avoids a real Docker build.
+
+    Emits a bare ``AWS::Lambda::Function`` via ``CfnFunction`` and hands the
+    stack an imported function around it, so no execution role, asset or
+    Function-level validation is synthesised.
+    """
+    import aws_cdk.aws_iam as iam
+    import aws_cdk.aws_lambda as _lambda
+
+    cfn_fn = _lambda.CfnFunction(
+        scope, id,
+        role=FAKE_ROLE_ARN,
+        code=_lambda.CfnFunction.CodeProperty(zip_file="pass"),
+        handler="index.handler",
+        runtime="python3.12",
+        function_name=function_name,
+        timeout=timeout.to_seconds() if timeout else None,
+        reserved_concurrent_executions=reserved_concurrent_executions,
+        architectures=[architecture.name] if architecture else None,
+        memory_size=memory_size,
+    )
+    # The stack attaches its Bedrock policy to this role, so it must be
+    # mutable; same_environment lets API Gateway add its invoke permission.
+    return _lambda.Function.from_function_attributes(
+        scope, f"{id}Ref",
+        function_arn=cfn_fn.attr_arn,
+        role=iam.Role.from_role_arn(scope, f"{id}Role", FAKE_ROLE_ARN),
+        same_environment=True,
+    )
+
+
+def _synth_to_disk(outdir: Path, env_name: str) -> str:
+    """Synthesise InvoiceNotifierStack into ``outdir`` and return the template JSON."""
+    import aws_cdk as core
+
+    from stack.invoice_notifier_stack import InvoiceNotifierStack
+
+    app = core.App(
+        outdir=str(outdir),
+        analytics_reporting=False,
+        context={"env_name": env_name},
+        post_cli_context=_SYNTH_CONTEXT,
+    )
+    test_env = core.Environment(account=TEST_ACCOUNT, region=TEST_REGION)
+    stack = InvoiceNotifierStack(
+        app, "TestStack", env=test_env, lambda_factory=_fake_docker_image_function,
+    )
+    app.synth()
+    return (outdir / stack.template_file).read_text()
+
+
+@pytest.fixture(scope="session")
+def template_json(tmp_path_factory) -> dict:
+    """Synthesise InvoiceNotifierStack into a temp cdk.out once and parse the template."""
+    return json.loads(_synth_to_disk(tmp_path_factory.mktemp("cdk.out"), "test"))
@@ -1,113 +1,93 @@
 """
 Unit tests for InvoiceNotifierStack.
 
-DockerImageFunction is replaced with a lightweight stand-in (inline Python)
-so that the suite runs without a Docker daemon.
+The ``template_json`` fixture lives in ``tests/conftest.py``; it passes a
+bare ``CfnFunction`` stand-in as the stack's ``lambda_factory`` so
+that the suite runs without a Docker daemon.
 
 Run:
     cd services/invoice-notifier/infra
     pytest tests/ -v
 """
-import aws_cdk as core
-import aws_cdk.assertions as assertions
-import aws_cdk.aws_lambda as _lambda
 import pytest
-from unittest.mock import patch
-
-from stack.invoice_notifier_stack import InvoiceNotifierStack
-
-# ── Constants ─────────────────────────────────────────────────────────────────
-
-TEST_ACCOUNT = "123456789012"
-TEST_REGION  = "ap-southeast-2"
-TEST_ENV     = core.Environment(account=TEST_ACCOUNT, region=TEST_REGION)
-
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-class _FakeDockerImageFunction(_lambda.Function):
-    """Stand-in for DockerImageFunction that avoids a real Docker build."""
-
-    def __init__(self, scope, id, *, function_name=None, timeout=None,
-                 reserved_concurrent_executions=None, **kwargs):
-        kwargs.pop("code", None)
-        super().__init__(
-            scope, id,
-            runtime=_lambda.Runtime.PYTHON_3_12,
-            handler="index.handler",
-            code=_lambda.InlineCode("def handler(e, c): pass"),
-            function_name=function_name,
-            timeout=timeout,
-            reserved_concurrent_executions=reserved_concurrent_executions,
-        )
-
-
-@pytest.fixture(scope="module")
-def template() -> assertions.Template:
-    """Synthesise InvoiceNotifierStack once and share across all tests."""
-    app = core.App(context={"env_name": "test"})
-    with patch("stack.invoice_notifier_stack._lambda.DockerImageFunction", _FakeDockerImageFunction):
-        stack = InvoiceNotifierStack(app, "TestStack", env=TEST_ENV)
-    return assertions.Template.from_stack(stack)
-
-
-# ── Lambda ────────────────────────────────────────────────────────────────────
-
-def test_lambda_function_name(template):
-    """Invoice notifier Lambda name must follow InvoiceNotifier-<env_name>."""
-    template.has_resource_properties("AWS::Lambda::Function", {
-        "FunctionName": "InvoiceNotifier-test",
-    })
-
-
-def test_lambda_timeout_is_five_minutes(template):
-    """Lambda timeout must be 300 s (5 min)."""
-    template.has_resource_properties("AWS::Lambda::Function", {
-        "FunctionName": "InvoiceNotifier-test",
-        "Timeout": 300,
-    })
+_FIND_CACHE = {}
+
+
+def find_resources(parsed: dict, type_: str, **props) -> list:
+    """Return the resources of ``type_`` whose Properties contain ``props``.
+
+    The template is walked once per distinct query; repeated queries are
+    served from a cache keyed on the query itself.
+    """
+    key = (id(parsed), type_, frozenset(props.items()))
+    if key not in _FIND_CACHE:
+        _FIND_CACHE[key] = [
+            resource
+            for resource in parsed["Resources"].values()
+            if resource["Type"] == type_
+            and all(resource.get("Properties", {}).get(k) == v for k, v in props.items())
+        ]
+    return _FIND_CACHE[key]
+
+
+# ── Stack shape ───────────────────────────────────────────────────────────────
+
+@pytest.fixture(scope="session")
+def stack_shape(template_json) -> dict:
+    """Lambda and API Gateway facts, gathered from the template once per session."""
+    (notifier,) = find_resources(template_json, "AWS::Lambda::Function", FunctionName="InvoiceNotifier-test")
+    props = notifier["Properties"]
+    return {
+        "lambda_name": props["FunctionName"],
+        "lambda_timeout": props["Timeout"],
+        "lambda_memory": props["MemorySize"],
+        "lambda_architectures": props["Architectures"],
+        "rest_api_count": len(find_resources(template_json, "AWS::ApiGateway::RestApi")),
+        "notify_path_defined": bool(find_resources(template_json, "AWS::ApiGateway::Resource", PathPart="notify")),
+        "post_method_defined": bool(find_resources(template_json, "AWS::ApiGateway::Method", HttpMethod="POST")),
+    }
+
+
+@pytest.mark.parametrize("fact, expected", [
+    ("lambda_name", "InvoiceNotifier-test"),   # InvoiceNotifier-<env_name>
+    ("lambda_timeout", 300),                   # 5 min
+    ("lambda_memory", 2048),
+    ("lambda_architectures", ["arm64"]),       # Graviton
+    ("rest_api_count", 1),
+    ("notify_path_defined", True),
+    ("post_method_defined", True),             # POST on /notify
+])
+def test_stack_shape(stack_shape, fact, expected):
+    """Notifier Lambda and REST API must match the expected configuration."""
+    assert stack_shape[fact] == expected
 
 
 # ── IAM ───────────────────────────────────────────────────────────────────────
 
-def test_bedrock_invoke_model_policy_attached(template):
+def test_bedrock_invoke_model_policy_attached(template_json):
     """Lambda execution role must include bedrock:InvokeModel."""
-    template.has_resource_properties("AWS::IAM::Policy", {
-        "PolicyDocument": {
-            "Statement": assertions.Match.array_with([
-                assertions.Match.object_like({
-                    "Action": assertions.Match.array_with(["bedrock:InvokeModel"]),
-                    "Effect": "Allow",
-                    "Resource": "*",
-                })
-            ])
-        }
-    })
-
-
-# ── API Gateway ───────────────────────────────────────────────────────────────
-
-def test_api_gateway_rest_api_created(template):
-    """Stack must define exactly one REST API."""
-    template.resource_count_is("AWS::ApiGateway::RestApi", 1)
-
-
-def test_api_gateway_notify_resource_path(template):
-    """The /notify path part must be defined in the REST API."""
-    template.has_resource_properties("AWS::ApiGateway::Resource", {
-        "PathPart": "notify",
-    })
-
+    def grants_invoke_model(stmt: dict) -> bool:
+        actions = stmt.get("Action")
+        if not isinstance(actions, list):
+            actions = [actions]
+        return (
+            stmt.get("Effect") == "Allow"
+            and stmt.get("Resource") == "*"
+            and "bedrock:InvokeModel" in actions
+        )
 
-def test_api_gateway_post_method_exists(template):
-    """A POST method must be wired to the /notify resource."""
-    template.has_resource_properties("AWS::ApiGateway::Method", {
-        "HttpMethod": "POST",
-    })
+    assert any(
+        grants_invoke_model(stmt)
+        for policy in find_resources(template_json, "AWS::IAM::Policy")
+        for stmt in policy["Properties"]["PolicyDocument"]["Statement"]
+    )
 
 
 # ── Outputs ───────────────────────────────────────────────────────────────────
 
-def test_notifier_api_url_output_exported(template):
+def test_notifier_api_url_output_exported(template_json):
     """CloudFormation stack must export NotifierApiUrl."""
-    template.has_output("NotifierApiUrl", {})
+    assert "NotifierApiUrl" in template_json["Outputs"]
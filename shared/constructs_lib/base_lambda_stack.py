@@ -1,6 +1,10 @@
 from aws_cdk import Stack, Tags
 from constructs import Construct
 
+# Tags applied to every service stack, alongside the per-stack Service and
+# Environment tags.
+_STANDARD_TAGS = (("ManagedBy", "CDK"),)
+
 
 class BaseServiceStack(Stack):
     """Base CDK Stack for all services in this mono-repo.
@@ -21,6 +25,6 @@ class BaseServiceStack(Stack):
         self.service_name = service_name
         self.env_name = self.node.try_get_context("env_name") or "dev"
 
-        Tags.of(self).add("Service", service_name)
-        Tags.of(self).add("ManagedBy", "CDK")
-        Tags.of(self).add("Environment", self.env_name)
+        tags = (("Service", service_name), *_STANDARD_TAGS, ("Environment", self.env_name))
+        for key, value in tags:
+            Tags.of(self).add(key, value)